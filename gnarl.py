@@ -10,13 +10,31 @@
 Lightweight Annotated Schema Serializable Objects.
 """
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from functools import lru_cache
+from itertools import repeat
+from datetime import datetime
 from delorean import Delorean
+from delorean.interface import parse as _delorean_parse
+from delorean.interface import now as _delorean_now
+import weakref
 import uuid
+import re
 import enum
 import json
 
 
+_hipack = None
+
+def _import_hipack():
+    # HiPack support is optional: import the module on first use only.
+    global _hipack
+    if _hipack is None:
+        import hipack
+        _hipack = hipack
+    return _hipack
+
+
 def _get_callable_repr(c):
     return c.__name__ if hasattr(c, "__name__") else repr(c)
 
@@ -53,29 +71,92 @@ class Optional(namedtuple("_Optional", "schema,default")):
         return super(Optional, cls).__new__(cls, schema, default)
 
 
+def _is_plain_type(s):
+    """
+    Checks whether a schema is a type validated just with `isinstance()`.
+    """
+    return issubclass(type(s), type) and \
+            not callable(getattr(s, "validate", None))
+
+
+# Types of literal values in schemas which are compared just with "==".
+_LITERAL_TYPES = frozenset((int, float, complex, bool, str, bytes,
+    type(None)))
+
+
 class And(namedtuple("_And", "args,error")):
-    __slots__ = ()
+    # Instances have a __dict__, used to keep the compiled validators and
+    # the representation out of the tuple fields.
 
     def __new__(cls, *args, error=None):
-        return super(And, cls).__new__(cls, args, error)
+        self = super(And, cls).__new__(cls, args, error)
+        self._types, self._validators = cls._compile_args(args, error)
+        # The representation is used in error messages, format it only once.
+        self._description = "{!s}({!s})".format(cls.__name__,
+                ", ".join(repr(a) for a in args))
+        return self
+
+    @classmethod
+    def _make(cls, iterable):
+        # Used by _replace(), goes through __new__() to compile the result.
+        args, error = iterable
+        return cls(*args, error=error)
+
+    def __getstate__(self):
+        # The compiled data is not part of the value, nor can be pickled.
+        return None
+
+    @staticmethod
+    def _compile_args(args, error):
+        return (), tuple(Schema._compile(a, error) for a in args)
 
     def __repr__(self):
-        return "{!s}({!s})".format(self.__class__.__name__,
-                ", ".join(repr(a) for a in self.args))
+        return self._description
 
     def validate(self, data):
-        for s in (Schema(s, self.error) for s in self.args):
-            data = s.validate(data)
+        for f in self._validators:
+            data = f(data)
         return data
 
 
 class Or(And):
-    __slots__ = ()
+    @staticmethod
+    def _compile_args(args, error):
+        # Runs of plain types are kept as tuples, each checked at once with
+        # a single isinstance() call instead of raising and catching one
+        # SchemaError per type. Likewise, runs of literal values are checked
+        # with a single validator. Types after other schemas must still be
+        # tried in order, as the preceding schemas may convert the data.
+        validators = []
+        for a in args:
+            if _is_plain_type(a):
+                if validators and type(validators[-1]) is tuple:
+                    validators[-1] += (a,)
+                else:
+                    validators.append((a,))
+            elif type(a) in _LITERAL_TYPES:
+                if validators and type(validators[-1]) is list:
+                    validators[-1].append(a)
+                else:
+                    validators.append([a])
+            else:
+                validators.append(Schema._compile(a, error))
+        validators = [Schema._compile_values(tuple(v), error)
+                if type(v) is list else v for v in validators]
+        if validators and type(validators[0]) is tuple:
+            return validators[0], tuple(validators[1:])
+        return (), tuple(validators)
 
     def validate(self, data):
-        for s in (Schema(s, self.error) for s in self.args):
+        if isinstance(data, self._types):
+            return data
+        for f in self._validators:
+            if type(f) is tuple:
+                if isinstance(data, f):
+                    return data
+                continue
             try:
-                return s.validate(data)
+                return f(data)
             except SchemaError as ex:
                 pass
         raise SchemaError(self.error if self.error is not None
@@ -103,12 +184,17 @@ class Use(namedtuple("_Use", "func,error")):
                     else "{!s}({!r}) raised {!r}".format(f, data, ex))
 
 
+@lru_cache(maxsize=512)
+def _compile_regex(pattern, *arg, **kw):
+    return re.compile(pattern, *arg, **kw)
+
+
 class StringMatch(namedtuple("_StringMatch", "regex,error")):
     __slots__ = ()
 
     def __new__(cls, pattern, error=None, *arg, **kw):
-        from re import compile as re_compile
-        return super(StringMatch, cls).__new__(cls, re_compile(pattern, *arg, **kw), error)
+        return super(StringMatch, cls).__new__(cls,
+                _compile_regex(pattern, *arg, **kw), error)
 
     def __repr__(self):
         return "{!s}({!r})".format(self.__class__.__name__, self.regex.pattern)
@@ -124,83 +210,313 @@ class StringMatch(namedtuple("_StringMatch", "regex,error")):
                     "{!r} is not a string".format(data))
 
 
+def _raise_missing_keys(required, data):
+    missing = ", ".join(repr(k) for k in sorted(required - data.keys()))
+    raise SchemaError("Missing keys: " + missing)
+
+
+def _raise_wrong_keys(data, keys):
+    extra = ", ".join(repr(k) for k in sorted(data.keys() - keys))
+    raise SchemaError("Wrong keys in {!r}: {!s}".format(data, extra))
+
+
+def _compile_dict_fields(schema, error=None):
+    """
+    Compiles the schema of each value of a dictionary schema, returning a
+    dictionary which maps keys to their validator functions.
+    """
+    return dict((k, Schema._compile(v.schema if type(v) is Optional else v,
+        error)) for k, v in schema.items())
+
+
+def _generate_dict_validator(schema, validators, error=None):
+    """
+    Generates the source of a function which validates data against a
+    dictionary schema, compiles it, and returns the resulting function.
+
+    Plain type checks are emitted inline, the rest of the sub-schemas are
+    validated calling the functions from the `validators` dictionary, as
+    returned by `_compile_dict_fields()`. Failed checks also defer to these,
+    which produce the same error messages as `Schema.validate()`. Keys of
+    the result, including defaults of optional keys, follow schema order.
+    """
+    required = frozenset(k for k, v in schema.items()
+            if type(v) is not Optional)
+    env = {
+        "_check": Schema._compile_type(dict, error),
+        "_required": required,
+        "_keys": frozenset(schema.keys()),
+        "_raise_missing_keys": _raise_missing_keys,
+        "_raise_wrong_keys": _raise_wrong_keys,
+    }
+    lines = [
+        "def __fast_validate__(data):",
+        "    if not isinstance(data, dict):",
+        "        _check(data)",
+        "    if not _required <= data.keys():",
+        "        _raise_missing_keys(_required, data)",
+        "    new = type(data)()",
+    ]
+    has_defaults = False
+    for i, (k, v) in enumerate(schema.items()):
+        if type(k) is str:
+            key = repr(k)
+        else:
+            key = "_k{}".format(i)
+            env[key] = k
+        default = None
+        if type(v) is Optional:
+            if v.default is not _OPTIONAL_NO_DEFAULT_MARK:
+                default = "_d{}".format(i)
+                env[default] = v.default
+            v = v.schema
+        env["_f{}".format(i)] = validators[k]
+        lines.append("    if {} in data:".format(key))
+        lines.append("        v = data[{}]".format(key))
+        if _is_plain_type(v):
+            env["_t{}".format(i)] = v
+            lines.append("        new[{0}] = v if isinstance(v, _t{1}) "
+                    "else _f{1}(v)".format(key, i))
+        else:
+            lines.append("        new[{}] = _f{}(v)".format(key, i))
+        if default is not None:
+            has_defaults = True
+            lines.append("    else:")
+            lines.append("        new[{}] = {}".format(key, default))
+    if has_defaults:
+        # Defaults make the result larger than the input, so comparing
+        # their lengths does not tell whether there were extra keys.
+        lines.append("    if not data.keys() <= _keys:")
+    else:
+        lines.append("    if len(data) != len(new):")
+    lines.append("        _raise_wrong_keys(data, _keys)")
+    lines.append("    return new")
+
+    code = compile("\n".join(lines), "<gnarl>", "exec")
+    exec(code, env)
+    return env["__fast_validate__"]
+
+
+# Maps schema keys to compiled validator functions. Entries are dropped
+# once no Schema holds a reference to the function.
+_SCHEMA_INTERN = weakref.WeakValueDictionary()
+
+def _schema_key(s):
+    """
+    Returns a hashable key which is the same for equivalent schemas.
+
+    The type of each element is part of the key, so e.g. ``1`` and ``True``
+    (which compare equal) produce different keys. Raises `TypeError` if the
+    schema contains unhashable elements.
+    """
+    t = type(s)
+    if t is dict:
+        return (t, tuple(((type(k), k), _schema_key(v))
+            for k, v in s.items()))
+    if t is list or t is tuple:
+        return (t, tuple(_schema_key(a) for a in s))
+    if t is set or t is frozenset:
+        return (t, frozenset(_schema_key(a) for a in s))
+    if t is Optional:
+        return (t, _schema_key(s.schema), (type(s.default), s.default))
+    key = (t, s)
+    hash(key)
+    return key
+
+
 class Schema(object):
-    __slots__ = ("_schema", "_error")
+    __slots__ = ("_schema", "_error", "_validate")
 
     def __init__(self, schema, error=None):
         self._schema = schema
         self._error = error
+        self._validate = self._compile(schema, error)
 
     def __repr__(self):
         return "{!s}({!r})".format(self.__class__.__name__, self._schema)
 
-    def __pcall(self, f, data, exc_format=None, *exc_args):
+    def validate(self, data):
+        return self._validate(data)
+
+    @classmethod
+    def _compile(cls, s, e=None):
+        """
+        Walks a schema once, returning a function which validates data.
+
+        Equivalent schemas share the same function, which is looked up in
+        the interning table using the key returned by `_schema_key()`.
+        """
         try:
-            return f(data)
-        except SchemaError as ex:
-            raise ex if self._error is None else SchemaError(self._error)
-        except BaseException as ex:
-            e = self._error
-            if e is None:
-                if exc_format is None:
-                    e = "{!s}({!r})".format(f, data)
-                else:
-                    e = exc_format.format(*exc_args)
-                e += " raised {!r}".format(ex)
-            raise SchemaError(e)
+            key = (_schema_key(s), e)
+            f = _SCHEMA_INTERN.get(key)
+        except TypeError:  # Unhashable schema, cannot be interned.
+            return cls._compile_schema(s, e)
+        if f is None:
+            f = cls._compile_schema(s, e)
+            _SCHEMA_INTERN[key] = f
+        return f
+
+    # Compilation methods for the exact types of built-in collections,
+    # which avoids going through the chain of checks below for them.
+    _compile_dispatch = {
+        list: "_compile_sequence",
+        tuple: "_compile_sequence",
+        set: "_compile_sequence",
+        frozenset: "_compile_sequence",
+        dict: "_compile_dict",
+        StringMatch: "_compile_string_match",
+    }
 
-    def validate(self, data):
-        s = self._schema
-        e = self._error
+    @classmethod
+    def _compile_schema(cls, s, e):
+        method = cls._compile_dispatch.get(type(s))
+        if method is not None:
+            return getattr(cls, method)(s, e)
         if callable(getattr(s, "validate", None)):
-            return self.__pcall(s.validate, data, "{!r}.validate({!r})", s, data)
+            return cls._compile_validate(s, e)
         if isinstance(s, (list, tuple, set, frozenset)):
-            data = Schema(type(s), e).validate(data)
-            o = Or(*s, error=e)
-            return type(data)(o.validate(d) for d in data)
+            return cls._compile_sequence(s, e)
         if isinstance(s, dict):
-            data = Schema(dict, e).validate(data)
-            new = type(data)()
-            seen = set()
-            for k, v in s.items():
-                if type(v) is Optional:
-                    if k in data:
-                        new[k] = Schema(v.schema, e).validate(data[k])
-                        seen.add(k)
-                elif k in data:
-                    new[k] = Schema(v, e).validate(data[k])
-                    seen.add(k)
-            required = set(k for k, v in s.items() if type(v) is not Optional)
-            if not required.issubset(seen):
-                missing = ", ".join(repr(k) for k in sorted(required - seen))
-                raise SchemaError("Missing keys: " + missing)
-            extra = data.keys() - s.keys()
-            if len(extra):
-                extra = ", ".join(repr(k) for k in sorted(extra))
-                raise SchemaError("Wrong keys in {!r}: {!s}".format(data, extra))
-            # Apply optionals with default values
-            defaults = set(k for k, v in s.items() if type(v) is Optional
-                    and v.default is not _OPTIONAL_NO_DEFAULT_MARK) - seen
-            for k in defaults:
-                new[k] = s[k].default
-            return new
+            return cls._compile_dict(s, e)
         if issubclass(type(s), type):
+            return cls._compile_type(s, e)
+        if callable(s):
+            return cls._compile_callable(s, e)
+        return cls._compile_value(s, e)
+
+    @staticmethod
+    def _compile_validate(s, e):
+        if e is None and type(s) in (Schema, And, Or, Use):
+            # These only raise SchemaError, which would be re-raised as-is:
+            # use their validation function directly, without a wrapper.
+            return s._validate if type(s) is Schema else s.validate
+        if isinstance(s, type) and issubclass(s, Enum) and \
+                s.validate.__func__ is Enum.validate.__func__:
+            f = s._compile_validator()
+        else:
+            f = s.validate
+        def validate(data):
+            try:
+                return f(data)
+            except SchemaError as ex:
+                raise ex if e is None else SchemaError(e)
+            except BaseException as ex:
+                raise SchemaError(e if e is not None else
+                        "{!r}.validate({!r}) raised {!r}".format(s, data, ex))
+        return validate
+
+    @staticmethod
+    def _compile_string_match(s, e):
+        # Same as StringMatch.validate(), with the regex method bound once.
+        match = s.regex.match
+        pattern = s.regex.pattern
+        if e is None:
+            e = s.error
+        def validate(data):
+            if isinstance(data, str):
+                if match(data):
+                    return data
+                raise SchemaError(e if e is not None else
+                        "{!r} does not match regex {!r}".format(data, pattern))
+            raise SchemaError(e if e is not None else
+                    "{!r} is not a string".format(data))
+        return validate
+
+    @classmethod
+    def _compile_sequence(cls, s, e):
+        kind = type(s)
+        check = cls._compile(kind, e)
+        validate_item = Or(*s, error=e).validate
+        if s and all(_is_plain_type(item) for item in s):
+            types = tuple(s)
+        else:
+            types = None
+        def validate(data):
+            if not isinstance(data, kind):
+                check(data)  # Raises SchemaError
+            t = type(data)
+            # Items of plain types are checked in a single pass which does
+            # not run Python code for each item. Invalid items are found
+            # again below, to produce the same error messages.
+            if types is not None and all(map(isinstance, data,
+                    repeat(types))):
+                return data.copy() if t is list or t is set else t(data)
+            if t is list:
+                return [validate_item(d) for d in data]
+            if t is tuple:
+                return tuple([validate_item(d) for d in data])
+            if t is set:
+                return {validate_item(d) for d in data}
+            if t is frozenset:
+                return frozenset([validate_item(d) for d in data])
+            return t(validate_item(d) for d in data)
+        return validate
+
+    @staticmethod
+    def _compile_dict(s, e):
+        return _generate_dict_validator(s, _compile_dict_fields(s, e), e)
+
+    @staticmethod
+    def _compile_type(s, e):
+        def validate(data):
             if isinstance(data, s):
                 return data
-            else:
+            raise SchemaError(e if e is not None else
+                    "{!r} should be instance of {!r}".format(data, s))
+        return validate
+
+    @staticmethod
+    def _compile_callable(s, e):
+        def validate(data):
+            try:
+                result = s(data)
+            except SchemaError as ex:
+                raise ex if e is None else SchemaError(e)
+            except BaseException as ex:
                 raise SchemaError(e if e is not None else
-                        "{!r} should be instance of {!r}".format(data, s))
-        if callable(s):
-            if self.__pcall(s, data):
+                        "{!s}({!r}) raised {!r}".format(s, data, ex))
+            if result:
                 return data
             raise SchemaError(e if e is not None
                     else "{!s}({!r}) should evaluate to True".format(
                         _get_callable_repr(s), data))
-        if s == data:
-            return data
-        else:
+        return validate
+
+    @staticmethod
+    def _compile_value(s, e):
+        def validate(data):
+            # Identity is checked first, which is cheaper for singletons
+            # like None, small integers, and interned strings.
+            if data is s or s == data:
+                return data
             raise SchemaError(e if e is not None else
                     "{!r} should be {!r}".format(data, s))
+        return validate
+
+    @classmethod
+    def _compile_values(cls, s, e):
+        if len(s) == 1:
+            return cls._compile(s[0], e)
+        def validate(data):
+            # Containment checks identity, then equality, for each item.
+            if data in s:
+                return data
+            raise SchemaError(e if e is not None else
+                    "{!r} should be one of {!r}".format(data, s))
+        return validate
+
+
+# Whether types provide a "jsonable" attribute, checked once per type. A
+# plain dictionary is used because lookups in a WeakKeyDictionary take
+# longer than the hasattr() check itself.
+_JSONABLE_TYPES = {}
+
+def _is_jsonable(o):
+    t = type(o)
+    result = _JSONABLE_TYPES.get(t)
+    if result is None:
+        result = _JSONABLE_TYPES[t] = hasattr(t, "jsonable")
+    return result
 
 
 class GnarlJSONEncoder(json.JSONEncoder):
@@ -226,16 +542,46 @@ class GnarlJSONEncoder(json.JSONEncoder):
                 return self.datetime.isoformat()
     """
     def default(self, o):
-        if hasattr(o, "jsonable"):
+        if _is_jsonable(o):
             return o.jsonable
-        else:  # pragma: nocover
-            return super(JSONEncoder, self).default(o)
+        else:
+            return super(GnarlJSONEncoder, self).default(o)
+
+
+# Shared encoder for the default options, like json.dumps() does internally.
+_json_encoder = GnarlJSONEncoder()
+_json_encode_str = json.encoder.encode_basestring_ascii
+
+# Scanner of a decoder with the default options, as used by json.loads().
+_json_scan_once = json.JSONDecoder().scan_once
+
+def _json_loads(data):
+    """
+    Same as `json.loads()` with the default options.
+
+    Most of the time spent by `json.loads()` on small documents goes to
+    setting up the decoding, and skipping whitespace around the value.
+    Strings without surrounding whitespace are passed directly to the
+    scanner; other input, and errors, are handled by `json.loads()`.
+    """
+    if type(data) is str:
+        try:
+            value, end = _json_scan_once(data, 0)
+        except StopIteration:
+            pass
+        else:
+            if end == len(data):
+                return value
+    return json.loads(data)
 
 
 class JSONable(object):
     """
     Mix-in class which adds methods to serialize to/from JSON.
     """
+    # Without this, subclasses using __slots__ would still get a __dict__.
+    __slots__ = ()
+
     def to_json(self, *arg, **kw):
         """
         Serializes an object to JSON using `GnarlJSONEncoder`.
@@ -243,7 +589,9 @@ class JSONable(object):
         Positional and keyword arguments are passed down to the `json.dump()`
         function from the Python standard library.
         """
-        return json.dumps(self, cls=GnarlJSONEncoder, *arg, **kw)
+        if arg or kw:
+            return json.dumps(self, cls=GnarlJSONEncoder, *arg, **kw)
+        return _json_encoder.encode(self)
 
     @classmethod
     def from_json(cls, data, encoding=None):
@@ -256,11 +604,23 @@ class JSONable(object):
         to validate the input data, and optionally return an object which
         represents the deserialized data.
         """
-        return cls.validate(json.loads(data))
+        return cls.validate(_json_loads(data))
+
+    @classmethod
+    def validate_many(cls, items):
+        """
+        Validates each element of an iterable with the `.validate()` class
+        method, returning a list with the results.
+
+        This avoids looking up the method again for each element, which
+        can be noticeable when validating many values.
+        """
+        validate = cls.validate
+        return [validate(item) for item in items]
 
     @staticmethod
     def __to_hipack_serializable(o):
-        return (o.jsonable if hasattr(o, "jsonable") else o, None)
+        return (o.jsonable if _is_jsonable(o) else o, None)
 
     def to_hipack(self, indent=False):
         """
@@ -268,8 +628,8 @@ class JSONable(object):
 
         The `indent` argument is passed to `hipack.dumps()`.
         """
-        from hipack import dumps
-        return dumps(self, indent=indent, value=self.__to_hipack_serializable)
+        return _import_hipack().dumps(self, indent=indent,
+                value=self.__to_hipack_serializable)
 
     @classmethod
     def from_hipack(cls, data, encoding=None):
@@ -282,8 +642,7 @@ class JSONable(object):
         optionally returning an object which represents the deserialized
         data.
         """
-        from hipack import loads
-        return cls.validate(loads(data))
+        return cls.validate(_import_hipack().loads(data))
 
 
 class Enum(JSONable, enum.Enum):
@@ -305,12 +664,109 @@ class Enum(JSONable, enum.Enum):
     """
     @classmethod
     def validate(cls, data):
-        return data if isinstance(data, cls) else cls(data)
+        # Enumerations with members cannot be subclassed, so checking the
+        # exact type is enough for them, and faster than isinstance().
+        if type(data) is cls:
+            return data
+        try:
+            # Map built by enum.Enum at class creation, same as used by
+            # cls(data), minus the overhead of the constructor.
+            return cls._value2member_map_[data]
+        except (KeyError, TypeError):
+            # Unhashable values, or not found: let cls(data) handle them.
+            return data if isinstance(data, cls) else cls(data)
+
+    @classmethod
+    def _compile_validator(cls):
+        """
+        Returns a function equivalent to `validate()`, used when compiling
+        schemas. Attribute lookups on enumeration classes are slow because
+        `enum.EnumMeta` defines `__getattr__()`, the function does them once.
+        """
+        members = cls._value2member_map_
+        def validate(data):
+            if type(data) is cls:
+                return data
+            try:
+                return members[data]
+            except (KeyError, TypeError):
+                return data if isinstance(data, cls) else cls(data)
+        return validate
 
     @property
     def jsonable(self):
         return self.value
 
+    def to_json(self, *arg, **kw):
+        if arg or kw:
+            return super(Enum, self).to_json(*arg, **kw)
+        # Members are constant, their JSON representation can be reused.
+        try:
+            return self._json_text
+        except AttributeError:
+            self._json_text = super(Enum, self).to_json()
+            return self._json_text
+
+
+_RFC_2822_MONTHS = dict((m, i + 1) for i, m in enumerate(("Jan", "Feb",
+    "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")))
+_RFC_2822_RE = re.compile(r"(?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun), )?"
+        r"(\d{1,2}) (" + "|".join(_RFC_2822_MONTHS) + r") (\d{4})"
+        r"(?: (\d{2}):(\d{2})(?::(\d{2}))? ([+-]\d{2})(\d{2}))?")
+
+def _rfc2822_to_iso(data):
+    """
+    Rewrites an RFC 2822 date as ISO 8601, or returns `None` if the input
+    is not in the expected format.
+
+    Delorean recognizes ISO 8601 much faster than the formats which need
+    going through the generic parser from `dateutil`.
+    """
+    # RFC 2822 dates take from 10 ("1 Jan 2015") to 31 characters, and
+    # cannot have a dash after the year like ISO 8601 ones: skip running
+    # the regular expression for input which cannot match.
+    if not 10 <= len(data) <= 31 or data[4:5] == "-":
+        return None
+    match = _RFC_2822_RE.fullmatch(data)
+    if match is None:
+        return None
+    day, month, year, hour, minute, second, tz_hour, tz_minute = \
+            match.groups()
+    date = "{}-{:02d}-{:02d}".format(year, _RFC_2822_MONTHS[month], int(day))
+    if hour is None:
+        return date
+    if tz_hour[1:] == "00" and tz_minute == "00":
+        # The generic parser may pick the local time zone for zero offsets,
+        # leave those to it to keep the resulting time zone unchanged.
+        return None
+    return "{}T{}:{}:{}{}:{}".format(date, hour, minute, second or "00",
+            tz_hour, tz_minute)
+
+
+# Only available in Python 3.7+.
+_datetime_fromisoformat = getattr(datetime, "fromisoformat", None)
+
+def _parse_iso_8601(data):
+    """
+    Parses an ISO 8601 date using `datetime.fromisoformat()`, or returns
+    `None` if the input is not supported, or if the result could differ from
+    the one obtained from Delorean.
+
+    Naïve results are in UTC, as Delorean assumes. Zero offsets are left to
+    Delorean, which converts them to the named UTC time zone.
+    """
+    if _datetime_fromisoformat is None or data[4:5] != "-" or \
+            data[7:8] != "-":
+        return None
+    try:
+        dt = _datetime_fromisoformat(data)
+    except ValueError:
+        return None
+    offset = dt.utcoffset()
+    if offset is None:
+        return dt
+    return None if not offset else dt
+
 
 class Timestamp(Delorean, JSONable):
     FORMAT_ISO_8601      = object()
@@ -330,8 +786,6 @@ class Timestamp(Delorean, JSONable):
 
     @classmethod
     def validate(cls, data, timezone=None):
-        from datetime import datetime
-
         if isinstance(data, cls):
             return data
         elif isinstance(data, datetime):
@@ -340,14 +794,27 @@ class Timestamp(Delorean, JSONable):
             return cls(data, timezone)
         else:
             if not isinstance(data, Delorean):
-                from delorean.interface import parse
-                data = parse(data, dayfirst=False)
+                if isinstance(data, str):
+                    iso = _rfc2822_to_iso(data)
+                    dt = _parse_iso_8601(data if iso is None else iso)
+                    if dt is not None:
+                        if dt.tzinfo is None:
+                            return cls(dt, "UTC")
+                        return cls(dt.replace(tzinfo=None), dt.tzinfo)
+                    if iso is not None:
+                        try:
+                            d = _delorean_parse(iso, dayfirst=False)
+                        except ValueError:
+                            # Parse again the original input, for errors
+                            # to mention it instead of the rewritten one.
+                            d = _delorean_parse(data, dayfirst=False)
+                        return cls(d.datetime, d.timezone)
+                data = _delorean_parse(data, dayfirst=False)
             return cls(data.datetime, data.timezone)
 
     @classmethod
     def now(cls):
-        from delorean.interface import now
-        d = now()
+        d = _delorean_now()
         d.truncate("second")
         return cls(d.datetime, d.timezone)
 
@@ -355,26 +822,78 @@ class Timestamp(Delorean, JSONable):
 
     @classmethod
     def today(cls):
-        from delorean.interface import now
-        d = now()
+        d = _delorean_now()
         d.truncate("day")
         return cls(d.datetime, d.timezone)
 
 
+if hasattr(uuid, "SafeUUID"):
+    # Python 3.7+, where uuid.UUID stores its attributes in slots.
+    _uuid_set_int = uuid.UUID.int.__set__
+    _uuid_set_is_safe = uuid.UUID.is_safe.__set__
+    _uuid_safe_unknown = uuid.SafeUUID.unknown
+else:
+    def _uuid_set_int(obj, value):
+        obj.__dict__["int"] = value
+    _uuid_set_is_safe = None
+_bytes_fromhex = bytes.fromhex
+_int_from_bytes = int.from_bytes
+
+
+# UUIDs are immutable, so parsed values can be shared. The same identifiers
+# tend to appear many times (e.g. references to other objects).
+@lru_cache(maxsize=256)
+def _parse_uuid(cls, data):
+    # Fast paths for the usual forms, with and without dashes, which decode
+    # the hexadecimal digits with bytes.fromhex(). Whitespace between pairs
+    # of digits is accepted by it, but then less than 16 bytes are decoded.
+    # Other forms (braces, URNs) and invalid input are left to uuid.UUID.
+    n = len(data)
+    if n == 32:
+        digits = data
+    elif n == 36 and data[8] == data[13] == data[18] == data[23] == "-":
+        digits = data.replace("-", "")
+    elif n < 32:
+        # Too short to contain all the digits, whichever the form.
+        raise ValueError("badly formed hexadecimal UUID string")
+    else:
+        return cls(data)
+    try:
+        value = _bytes_fromhex(digits)
+    except ValueError:
+        return cls(data)
+    if len(value) != 16:
+        return cls(data)
+    return cls._from_int(_int_from_bytes(value, "big"))
+
+
 class UUID(uuid.UUID, JSONable):
+    __slots__ = ()
+
     X500 = uuid.NAMESPACE_X500
     URL  = uuid.NAMESPACE_URL
     DNS  = uuid.NAMESPACE_DNS
     OID  = uuid.NAMESPACE_OID
 
+    @classmethod
+    def _from_int(cls, value):
+        # Sets the attributes of uuid.UUID directly: going through its
+        # __init__ takes longer than parsing the hexadecimal digits.
+        result = object.__new__(cls)
+        _uuid_set_int(result, value)
+        if _uuid_set_is_safe is not None:
+            _uuid_set_is_safe(result, _uuid_safe_unknown)
+        return result
+
     @classmethod
     def validate(cls, data):
         if isinstance(data, cls):
             return data
         elif isinstance(data, uuid.UUID):
-            return cls(str(data))
-        else:
-            return cls(data)
+            return cls._from_int(data.int)
+        elif isinstance(data, str):
+            return _parse_uuid(cls, data)
+        return cls(data)
 
     @property
     def jsonable(self):
@@ -382,19 +901,135 @@ class UUID(uuid.UUID, JSONable):
 
     @classmethod
     def uuid1(cls, *arg, **kw):
-        return cls(str(uuid.uuid1(*arg, **kw)))
+        return cls._from_int(uuid.uuid1(*arg, **kw).int)
 
     @classmethod
     def uuid3(cls, *arg, **kw):
-        return cls(str(uuid.uuid3(*arg, **kw)))
+        return cls._from_int(uuid.uuid3(*arg, **kw).int)
 
     @classmethod
     def uuid4(cls, *arg, **kw):
-        return cls(str(uuid.uuid4(*arg, **kw)))
+        return cls._from_int(uuid.uuid4(*arg, **kw).int)
 
     @classmethod
     def uuid5(cls, *arg, **kw):
-        return cls(str(uuid.uuid5(*arg, **kw)))
+        return cls._from_int(uuid.uuid5(*arg, **kw).int)
+
+
+class _SchemedField(object):
+    """
+    Descriptor which provides attribute access to a schema field.
+    """
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj._data[self.key]
+        except KeyError:
+            raise AttributeError(self.key)
+
+    def __set__(self, obj, value):
+        type(obj).__setattr__(obj, self.key, value)
+
+
+def _generate_json_encoder(schema):
+    """
+    Generates the source of a function which serializes to JSON the data
+    validated by a dictionary schema, compiles it, and returns the resulting
+    function, or `None` if the schema has keys other than strings.
+
+    The output is the same as with `GnarlJSONEncoder` and default options,
+    with keys in the order of the schema. Keys are encoded in advance, and
+    values of the exact types `str`, `int` and (finite) `float` are formatted
+    inline, which avoids setting up the JSON encoder for them. Instances of
+    `JSONable` classes use their own `to_json()` method.
+    """
+    if not all(type(k) is str for k in schema):
+        return None
+    env = {
+        "_e": _json_encoder.encode,
+        "_s": _json_encode_str,
+        "_i": int.__repr__,
+        "_r": float.__repr__,
+    }
+    lines = [
+        "def __to_json__(data):",
+        "    parts = []",
+    ]
+    for i, (k, v) in enumerate(schema.items()):
+        if type(v) is Optional:
+            v = v.schema
+        if v is str:
+            value = "_s(v) if type(v) is str else _e(v)"
+        elif v is int:
+            value = "_i(v) if type(v) is int else _e(v)"
+        elif v is float:
+            value = "_r(v) if type(v) is float and v - v == 0.0 else _e(v)"
+        elif isinstance(v, type) and issubclass(v, JSONable):
+            # Default values of optional fields are not validated, and may
+            # not be instances of the class.
+            env["_c{}".format(i)] = v
+            value = "v.to_json() if isinstance(v, _c{}) else _e(v)".format(i)
+        else:
+            value = "_e(v)"
+        lines.append("    if {!r} in data:".format(k))
+        lines.append("        v = data[{!r}]".format(k))
+        lines.append("        parts.append({!r} + ({}))".format(
+            _json_encode_str(k) + ": ", value))
+    lines.append("    if len(parts) != len(data):")
+    lines.append("        return _e(data)")
+    lines.append("    return \"{\" + \", \".join(parts) + \"}\"")
+
+    code = compile("\n".join(lines), "<gnarl>", "exec")
+    exec(code, env)
+    return env["__to_json__"]
+
+
+# Types of values which cannot be modified after validation, and thus can
+# be shared by memoized results. Instances of subclasses of the types in
+# _IMMUTABLE_BASES (e.g. gnarl.UUID) can be shared as well.
+_IMMUTABLE_TYPES = frozenset((int, float, complex, bool, str, bytes,
+    type(None), uuid.UUID))
+_IMMUTABLE_BASES = (uuid.UUID, enum.Enum)
+_FLOAT_TYPES = frozenset((float, complex))
+
+def _memoize_dict_validator(validate, size):
+    """
+    Wraps a dictionary validator, remembering up to `size` of its most
+    recent results. Only results which contain immutable values are kept,
+    and copies of them are returned, so instances never share state.
+    """
+    cache = OrderedDict()
+    def memoized(data):
+        if type(data) is not dict:
+            return validate(data)
+        try:
+            # Types are part of the key because e.g. 1 == 1.0 == True.
+            # Floating point numbers are represented by their repr(), as
+            # 0.0 == -0.0 and NaN is not equal to itself.
+            key = frozenset((k, type(v), repr(v) if type(v) in _FLOAT_TYPES
+                else v) for k, v in data.items())
+            result = cache[key]
+        except TypeError:  # Unhashable values.
+            return validate(data)
+        except KeyError:
+            result = validate(data)
+            if all(type(v) in _IMMUTABLE_TYPES or
+                    isinstance(v, _IMMUTABLE_BASES) for v in result.values()):
+                cache[key] = result
+                if len(cache) > size:
+                    cache.popitem(last=False)
+            else:
+                return result
+        else:
+            cache.move_to_end(key)
+        return dict(result)
+    return memoized
 
 
 class _SchemedMeta(type):
@@ -402,6 +1037,34 @@ class _SchemedMeta(type):
         result = type.__new__(cls, name, bases, classdict)
         if not isinstance(result.__schema__, Schema):
             result.__schema__ = Schema(result.__schema__)
+        schema = result.__schema__
+        # Subclasses of Schema may override validate(), in which case fields
+        # cannot be validated separately, and the method must be called.
+        if type(schema).validate is Schema.validate:
+            fast_validate = schema._validate
+        else:
+            fast_validate = schema.validate
+        if isinstance(schema._schema, dict) and \
+                fast_validate is schema._validate:
+            validators = _compile_dict_fields(schema._schema, schema._error)
+        else:
+            validators = {}
+        result.__field_validators__ = validators
+        # Reading fields through descriptors avoids the failed attribute
+        # lookup which precedes each call to Schemed.__getattr__().
+        for key in validators:
+            if isinstance(key, str) and key.isidentifier() and \
+                    not key.startswith("_") and not hasattr(result, key):
+                setattr(result, key, _SchemedField(key))
+        if result.__memoize__:
+            fast_validate = _memoize_dict_validator(fast_validate,
+                    result.__memoize__)
+        result.__fast_validate__ = staticmethod(fast_validate)
+        to_json = None
+        if isinstance(schema._schema, dict) and \
+                result.jsonable is Schemed.__dict__["jsonable"]:
+            to_json = _generate_json_encoder(schema._schema)
+        result.__to_json__ = None if to_json is None else staticmethod(to_json)
         return result
 
 
@@ -409,9 +1072,25 @@ class Schemed(JSONable, metaclass=_SchemedMeta):
     __schema__ = None
     __slots__  = ("_data",)
 
+    # Number of validation results remembered by the class. Memoization
+    # skips validating again the same field values, but it is only
+    # worthwhile for costly schemas (e.g. with UUID fields, or expensive
+    # checks), and it requires validation to be free of side effects.
+    # Results with values which may be modified later (including lists,
+    # dictionaries, and Timestamp objects) are not remembered.
+    __memoize__ = 0
+
     def __init__(self, *arg, **kw):
-        object.__setattr__(self, "_data", ())
-        self.update(*arg, **kw)
+        if type(self).update is not Schemed.update:
+            # Subclasses may customize update(), which must be used then.
+            object.__setattr__(self, "_data", ())
+            self.update(*arg, **kw)
+            return
+        # The validator builds a new dictionary, and "kw" is already a new
+        # one which can be passed down without copying it again.
+        if arg:
+            kw = dict(*arg, **kw)
+        object.__setattr__(self, "_data", self.__fast_validate__(kw))
 
     def __getattr__(self, key):
         d = object.__getattribute__(self, "_data")
@@ -424,30 +1103,93 @@ class Schemed(JSONable, metaclass=_SchemedMeta):
         if key.startswith("_"):
             object.__setattr__(self, key, value)
         else:
-            self.update({ key: value })
+            validate = self.__field_validators__.get(key)
+            if validate is None or type(self).update is not Schemed.update:
+                self.update({ key: value })
+            else:
+                # Only the value being set needs to be validated.
+                self._merge_validated({ key: validate(value) })
 
-    def update(self, *arg, **kw):
+    def _merge_validated(self, changes):
+        """
+        Replaces the data of the instance with a copy which includes the
+        already validated `changes`. New fields are placed in the order of
+        the schema, as validating the whole dictionary would do.
+        """
         d = dict(object.__getattribute__(self, "_data"))
-        d.update(*arg, **kw)
-        object.__setattr__(self, "_data", self.__schema__.validate(d))
+        added = not changes.keys() <= d.keys()
+        d.update(changes)
+        if added:
+            d = dict((k, d[k]) for k in self.__field_validators__ if k in d)
+        object.__setattr__(self, "_data", d)
+
+    def update(self, *arg, **kw):
+        if arg:
+            kw = dict(*arg, **kw)
+        validators = self.__field_validators__
+        if validators and kw.keys() <= validators.keys():
+            # Only the values being changed need to be validated. All of
+            # them are validated before modifying the instance.
+            self._merge_validated(dict((k, validators[k](v))
+                for k, v in kw.items()))
+        else:
+            d = dict(object.__getattribute__(self, "_data"))
+            d.update(kw)
+            object.__setattr__(self, "_data", self.__fast_validate__(d))
         return self
 
     @property
     def jsonable(self):
         return object.__getattribute__(self, "_data")
 
+    def to_json(self, *arg, **kw):
+        to_json = self.__to_json__
+        if arg or kw or to_json is None:
+            return super(Schemed, self).to_json(*arg, **kw)
+        return to_json(object.__getattribute__(self, "_data"))
+
     def __iter__(self):
-        return ((k, v) for (k, v)
-                in object.__getattribute__(self, "_data").items())
+        return iter(object.__getattribute__(self, "_data").items())
 
     def keys(self):
         return self._data.keys()
 
+    def has_field(self, key):
+        """
+        Checks whether a field has a value. Unlike `hasattr()`, this does
+        not need raising and catching an exception for missing fields.
+        """
+        return key in object.__getattribute__(self, "_data")
+
+    @classmethod
+    def __new_trusted__(cls, data):
+        """
+        Creates an instance from a dictionary which has already been
+        validated against the schema of the class, without validating it
+        again.
+        """
+        result = cls.__new__(cls)
+        object.__setattr__(result, "_data", data)
+        return result
+
     @classmethod
     def validate(cls, data):
         if isinstance(data, cls):
             return data
+        elif isinstance(data, Schemed) and data.__schema__ is cls.__schema__:
+            # Validated already against the same schema, e.g. an instance
+            # of a base class being converted to a subclass.
+            if cls.__init__ is not Schemed.__init__:
+                return cls(**data._data)
+            return cls.__new_trusted__(dict(data._data))
         elif isinstance(data, dict):
-            return cls(**data)
+            if cls.__init__ is not Schemed.__init__:
+                return cls(**data)
+            # Validation builds a new dictionary already, there is no
+            # need to copy the input into keyword arguments first. The
+            # result has the type of the input, which must be a plain dict.
+            if type(data) is not dict:
+                data = dict(data)
+            return cls.__new_trusted__(cls.__fast_validate__(data))
         else:
             raise ValueError(data)
@@ -8,8 +8,16 @@
 
 import unittest
 import doctest
+import uuid
+import json
+import re
+from collections import defaultdict, OrderedDict, Counter
+from datetime import datetime
+from delorean import Delorean
+from delorean.interface import parse
 from gnarl import Enum, Schemed, Optional, UUID, Timestamp
 from gnarl import Schema, SchemaError, And, Or, Use, StringMatch
+from gnarl import GnarlJSONEncoder, _json_loads
 
 
 class TestSchema(unittest.TestCase):
@@ -54,9 +62,9 @@ class TestSchema(unittest.TestCase):
     )
     def test_use_type_schemas(self):
         for item in self.use_type_schemas:
-            s = Use(item[0])
+            s = Schema(Use(item[0]))
             for expected, data in item[1:]:
-                self.assertEqual(expected, Schema(s).validate(data))
+                self.assertEqual(expected, s.validate(data))
 
     invalid_type_schemas = (
         (int, "1", {}, (), [], 2.1, object()),
@@ -68,9 +76,10 @@ class TestSchema(unittest.TestCase):
     )
     def test_invalid_type_schemas(self):
         for item in self.invalid_type_schemas:
+            s = Schema(item[0])
             for data in item[1:]:
                 with self.assertRaises(SchemaError):
-                    Schema(item[0]).validate(data)
+                    s.validate(data)
 
     invalid_use_type_schemas = (int, float, list, tuple, dict)
     def test_invalid_use_type_schemas(self):
@@ -110,6 +119,24 @@ class TestSchema(unittest.TestCase):
         with self.assertRaises(SchemaError):
             Or().validate(2)
 
+    def test_or_order(self):
+        self.assertEqual(5, Or(Use(int), str).validate("5"))
+        self.assertEqual("5", Or(str, Use(int)).validate("5"))
+        self.assertEqual(5, Or(str, Use(int)).validate(5.5))
+        self.assertEqual(5, Or(Use(int), float, str).validate("5"))
+        self.assertEqual("x", Or(Use(int), float, str).validate("x"))
+        with self.assertRaises(SchemaError):
+            Or(Use(int), float, str).validate(None)
+
+    def test_or_values(self):
+        schema = Or(None, 0, "a", 1.5, str)
+        for value in (None, 0, "a", 1.5, "b", 0.0, False):
+            self.assertEqual(value, schema.validate(value))
+        self.assertIs(False, schema.validate(False))
+        with self.assertRaises(SchemaError):
+            schema.validate(1)
+        self.assertEqual(2, Or(1, Use(int), 2).validate("2"))
+
     def test_validate_list(self):
         self.assertEqual([1, 0, 1, 1],
                 Schema([0, 1]).validate([1, 0, 1, 1]))
@@ -137,6 +164,30 @@ class TestSchema(unittest.TestCase):
         with self.assertRaises(SchemaError):
             And((1, 0), lambda l: len(l) > 2).validate((0, 1))
 
+    def test_validate_sequence_of_types(self):
+        data = [1, 2, 3]
+        value = Schema([int]).validate(data)
+        self.assertEqual(data, value)
+        self.assertIsNot(data, value)
+        self.assertEqual([1, "a"], Schema([int, str]).validate([1, "a"]))
+        self.assertEqual((1, 2), Schema((int,)).validate((1, 2)))
+        self.assertEqual({1, 2}, Schema({int}).validate({1, 2}))
+        try:
+            Schema([int]).validate([1, "a"])
+        except SchemaError as ex:
+            self.assertEqual("'a' did not validate Or(<class 'int'>)",
+                    ex.message)
+        else:
+            self.fail("SchemaError exception not raised")
+
+    def test_validate_list_error_message(self):
+        try:
+            Schema([0, 1]).validate([0, 2])
+        except SchemaError as ex:
+            self.assertEqual("2 did not validate Or(0, 1)", ex.message)
+        else:
+            self.fail("SchemaError exception not raised")
+
     def test_validate_set(self):
         self.assertEqual(set(), Schema({0, 1}).validate(set()))
         self.assertEqual({1, 0}, Schema({0, 1}).validate({0, 1, 1}))
@@ -225,21 +276,18 @@ class TestSchema(unittest.TestCase):
         self.assertEqual({ "a": 42, "b": 22 }, s.validate({ "b": 22 }))
 
     def test_dict_subtype_defaultdict(self):
-        from collections import defaultdict
         d = defaultdict(int, key=1)
         v = Schema({"key": 1}).validate(d)
         self.assertEqual(d, v)
         self.assertIsInstance(v, defaultdict)
 
     def test_dict_subtype_ordereddict(self):
-        from collections import OrderedDict
         d = OrderedDict(a=10, b=20)
         v = Schema({"a": 10, "b": 20}).validate(d)
         self.assertEqual(dict(d), dict(v))
         self.assertIsInstance(v, OrderedDict)
 
     def test_dict_subtype_counter(self):
-        from collections import Counter
         d = Counter("aaabbbcc")
         v = Schema({"a": int, "b": int, "c": 2}).validate(d)
         self.assertEqual(d, v)
@@ -250,6 +298,46 @@ class TestSchema(unittest.TestCase):
         r = "Schema([Or(None, And(<class 'str'>, Use(<class 'float'>)))])"
         self.assertEqual(r, repr(s))
 
+    def test_subclass_validate(self):
+        class Loud(Schema):
+            __slots__ = ()
+            def validate(self, data):
+                return ("overridden", super(Loud, self).validate(data))
+        self.assertEqual(("overridden", 1), Loud(int).validate(1))
+        self.assertEqual(1, Schema.validate(Loud(int), 1))
+        self.assertEqual([("overridden", 1)], Schema([Loud(int)]).validate([1]))
+        class Lower(Schema):
+            __slots__ = ()
+            def validate(self, data):
+                return super(Lower, self).validate(dict((k.lower(), v)
+                    for k, v in data.items()))
+        class Point(Schemed):
+            __schema__ = Lower({ "x": int })
+        value = Point(X=1)
+        self.assertEqual(1, value.x)
+        value.update(X=2)
+        self.assertEqual(2, value.x)
+
+    def test_and_or_fields(self):
+        for cls in (And, Or):
+            value = cls(int, float, error="error message")
+            self.assertEqual(("args", "error"), value._fields)
+            args, error = value
+            self.assertEqual((int, float), args)
+            self.assertEqual("error message", error)
+            value = value._replace(error=None)
+            self.assertEqual(cls(int, float), value)
+            with self.assertRaises(SchemaError):
+                value.validate("foo")
+
+    def test_schema_interning(self):
+        a = Schema({ "a": str, "b": [int], "c": Optional(int, default=0) })
+        b = Schema({ "a": str, "b": [int], "c": Optional(int, default=0) })
+        self.assertIs(a._validate, b._validate)
+        self.assertIsNot(Schema(1)._validate, Schema(True)._validate)
+        self.assertIsNot(Schema(int)._validate,
+                Schema(int, error="error message")._validate)
+
     def test_missing_keys_error_message(self):
         try:
             Schema({1: "x"}).validate({})
@@ -281,6 +369,32 @@ class TestStringMatch(unittest.TestCase):
         with self.assertRaises(SchemaError):
             Schema({"uid": StringMatch(r"[a-z][a-z_]+")}).validate({ "uid": "_" })
 
+    def test_nested_error_message(self):
+        s = Schema({"uid": StringMatch(r"[a-z][a-z_]+", "bad uid")})
+        try:
+            s.validate({ "uid": "_" })
+        except SchemaError as ex:
+            self.assertEqual("bad uid", ex.message)
+        else:
+            self.fail("SchemaError exception not raised")
+        try:
+            Schema(StringMatch(r"[a-z][a-z_]+"), "bad value").validate(1)
+        except SchemaError as ex:
+            self.assertEqual("bad value", ex.message)
+        else:
+            self.fail("SchemaError exception not raised")
+
+    def test_regex_shared(self):
+        a = StringMatch(r"[a-z][a-z_]+")
+        b = StringMatch(r"[a-z][a-z_]+", "error message")
+        self.assertIs(a.regex, b.regex)
+
+    def test_regex_flags(self):
+        m = StringMatch(r"[a-z][a-z_]+", None, re.IGNORECASE)
+        self.assertEqual("ABC", m.validate("ABC"))
+        with self.assertRaises(SchemaError):
+            StringMatch(r"[a-z][a-z_]+").validate("ABC")
+
     def test_repr(self):
         s = StringMatch(r"[a-z][a-z_]+")
         r = "StringMatch('[a-z][a-z_]+')"
@@ -295,12 +409,15 @@ class Continent(Enum):
     ANTARCTICA = "ANTARCTICA"
 
 class WithContinent(Schemed):
+    __slots__ = ()
     __schema__ = Schema({
         "continent" : Continent,
     })
 
     def __eq__(self, other):
-        return self.continent == other.continent
+        # Enum members are singletons, compare them by identity.
+        return self is other or (type(other) is WithContinent
+                and self.continent is other.continent)
 
 
 class TestEnum(unittest.TestCase):
@@ -323,6 +440,25 @@ class TestEnum(unittest.TestCase):
         self.assertIs(value, data)
         self.assertEqual(value, data)
 
+    def test_validate_invalid(self):
+        with self.assertRaises(ValueError):
+            Continent.validate("ATLANTIS")
+        with self.assertRaises(ValueError):
+            Continent.validate(["EUROPE"])
+
+    def test_validate_schema(self):
+        """
+        Check that Enum values are validated the same way when the Enum
+        is part of a Schema.
+        """
+        schema = Schema(Continent)
+        self.assertIs(Continent.ASIA, schema.validate("ASIA"))
+        self.assertIs(Continent.ASIA, schema.validate(Continent.ASIA))
+        for value in ("ATLANTIS", ["EUROPE"]):
+            with self.assertRaises(SchemaError):
+                schema.validate(value)
+        self.assertIs(Continent.ASIA, Enum.validate(Continent.ASIA))
+
     def test_to_json_with_continent(self):
         """
         Check whether serialization of an Enum value produces the expected
@@ -339,12 +475,38 @@ class TestEnum(unittest.TestCase):
         value = WithContinent(continent=Continent.EUROPE)
         self.assertEqual(b'continent:"EUROPE"', value.to_hipack().strip())
 
+    def test_validate_override(self):
+        """
+        Check whether a validate() method defined by an Enum subclass is
+        used when the enum is part of a schema.
+        """
+        class Ci(Enum):
+            A = "a"
+            B = "b"
+            @classmethod
+            def validate(cls, data):
+                return super(Ci, cls).validate(data.lower())
+        class WithCi(Schemed):
+            __schema__ = { "c": Ci }
+        self.assertIs(Ci.A, Ci.validate("A"))
+        self.assertIs(Ci.A, Schema(Ci).validate("A"))
+        self.assertIs(Ci.B, WithCi(c="B").c)
+
     def test_to_json(self):
         """
         Check whether an enum can be properly serialized.
         """
         self.assertEqual('"EUROPE"', Continent.EUROPE.to_json())
 
+    def test_to_json_cached(self):
+        """
+        Check whether repeated serialization of an Enum value reuses the
+        same output, and that options are still honored.
+        """
+        self.assertIs(Continent.ASIA.to_json(), Continent.ASIA.to_json())
+        self.assertEqual('"ASIA"', Continent.ASIA.to_json())
+        self.assertEqual('"ASIA"', Continent.ASIA.to_json(indent=2))
+
     def test_json_roundtrip(self):
         """
         Check wether an object with enums serializes properly to JSON and can
@@ -375,11 +537,55 @@ class TestUUID(unittest.TestCase):
         "",
         "blargh",
         "AFCEDEFSDSDS",
+        "5c2ddc84-bf99-47d2-a0da-3882b9d788eX",
+        "5c2ddc84-bf99-47d2-a0da-3882b9d788-e",
     )
 
+    @classmethod
+    def setUpClass(cls):
+        cls.parsed = tuple(UUID.validate_many(cls.valid))
+
     def test_parse_valid_uuids(self):
-        for u in self.valid:
-            uuid = UUID.validate(u)
+        for uuid in self.parsed:
+            self.assertIsInstance(uuid, UUID)
+
+    def test_parse_equivalent_uuids(self):
+        expected = uuid.UUID(self.valid[0])
+        for u in self.valid + ("{5c2ddc84-bf99-47d2-a0da-3882b9d788ed}",):
+            value = UUID.validate(u)
+            self.assertEqual(expected, value)
+            self.assertEqual(str(expected), str(value))
+            self.assertEqual(getattr(expected, "is_safe", None),
+                    getattr(value, "is_safe", None))
+
+    def test_parse_cached_subclass(self):
+        class MyUUID(UUID):
+            __slots__ = ()
+        self.assertIs(UUID.validate(self.valid[0]),
+                UUID.validate(self.valid[0]))
+        value = MyUUID.validate(self.valid[0])
+        self.assertIsInstance(value, MyUUID)
+        self.assertEqual(UUID.validate(self.valid[0]), value)
+
+    def test_parse_same_as_stdlib(self):
+        for u in ("5c2ddc84bf9947d2a0da3882b9d788e ",
+                  "5c 2ddc84bf9947d2a0da3882b9d788e",
+                  "+c2ddc84bf9947d2a0da3882b9d788ed",
+                  "5c2ddc84-bf99-47d2-a0da-3882b9d7 8ed",
+                  "5c2d-dc84bf9947d2a0da3882b9d788ed",
+                  "5c2ddc84bf9947d2a0da3882b9d788e"):
+            try:
+                expected = uuid.UUID(u)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    UUID.validate(u)
+            else:
+                self.assertEqual(expected, UUID.validate(u))
+
+    def test_parse_valid_uuids_many(self):
+        uuids = UUID.validate_many(self.valid)
+        self.assertEqual(len(self.valid), len(uuids))
+        for uuid in uuids:
             self.assertIsInstance(uuid, UUID)
 
     def test_parse_invalid_uuids(self):
@@ -391,6 +597,10 @@ class TestUUID(unittest.TestCase):
         value = UUID.uuid4()
         self.assertEqual(value, UUID.from_json(value.to_json()))
 
+    def test_json_roundtrip_parsed(self):
+        for value in self.parsed:
+            self.assertEqual(value, UUID.from_json(value.to_json()))
+
     def test_validate_object(self):
         data = UUID.uuid4()
         value = UUID.validate(data)
@@ -398,32 +608,32 @@ class TestUUID(unittest.TestCase):
         self.assertIs(value, data)
 
     def test_validate_uuid_stdlib_object(self):
-        import uuid
         data = uuid.uuid4()
         value = UUID.validate(data)
         self.assertIsInstance(value, UUID)
         self.assertEqual(data, value)
 
+    @unittest.skipUnless(hasattr(uuid.UUID, "__slots__"),
+            "uuid.UUID has no __slots__ before Python 3.8")
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(UUID.uuid4(), "__dict__"))
+
     def test_instantiate_uuid1(self):
-        import uuid
         value = UUID.uuid1()
         self.assertIsInstance(value, UUID)
         self.assertIsInstance(value, uuid.UUID)
 
     def test_instantiate_uuid3(self):
-        import uuid
         value = UUID.uuid3(UUID.URL, "http://gnarl.org")
         self.assertIsInstance(value, UUID)
         self.assertIsInstance(value, uuid.UUID)
 
     def test_instantiate_uuid4(self):
-        import uuid
         value = UUID.uuid4()
         self.assertIsInstance(value, UUID)
         self.assertIsInstance(value, uuid.UUID)
 
     def test_instantiate_uuid5(self):
-        import uuid
         value = UUID.uuid5(UUID.URL, "http://gnarl.org")
         self.assertIsInstance(value, UUID)
         self.assertIsInstance(value, uuid.UUID)
@@ -454,6 +664,10 @@ class TestTimestamp(unittest.TestCase):
         # "Tue, 22 Jun 2015 22:26:00 +0100",
     )
 
+    @classmethod
+    def setUpClass(cls):
+        cls.parsed = tuple(Timestamp.validate(d) for d in cls.valid)
+
     def test_parse_valid_timestamps(self):
         for date in self.valid:
             d = RFC2822Timestamp.validate(date)
@@ -463,6 +677,29 @@ class TestTimestamp(unittest.TestCase):
             self.assertIsInstance(d, Timestamp)
             self.assertIsInstance(d, RFC2822Date)
 
+    def test_parse_rfc2822_same_as_delorean(self):
+        for date in self.valid[:4] + ("1 Jan 2015",
+                "Thu, 1 Jan 2015 09:05 +0100"):
+            expected = parse(date, dayfirst=False)
+            d = Timestamp.validate(date)
+            self.assertEqual(expected.datetime, d.datetime)
+            self.assertEqual(expected.timezone, d.timezone)
+
+    def test_parse_iso8601_same_as_delorean(self):
+        for date in self.valid[4:] + ("1983-05-11", "1983-05-11T19:35",
+                "1983-05-11T19:35:45.123-02:30", "1983-05-11T19:35:45Z",
+                "1983-05-11T19:35:45+00:00", "1983-05-11T19:35:45"):
+            expected = parse(date, dayfirst=False)
+            d = Timestamp.validate(date)
+            self.assertEqual(expected.datetime, d.datetime)
+            self.assertEqual(expected.timezone, d.timezone)
+
+    def test_parse_valid_timestamps_many(self):
+        dates = RFC2822Timestamp.validate_many(self.valid)
+        self.assertEqual(len(self.valid), len(dates))
+        for d in dates:
+            self.assertIsInstance(d, RFC2822Timestamp)
+
     def test_parse_invalid_dates(self):
         for date in self.invalid:
             with self.assertRaises((ValueError, OverflowError)):
@@ -470,6 +707,14 @@ class TestTimestamp(unittest.TestCase):
             with self.assertRaises((ValueError, OverflowError)):
                 d = RFC2822Date.validate(date)
 
+    def test_parse_invalid_date_error(self):
+        with self.assertRaisesRegex(ValueError, "Mon, 31 Feb 2015"):
+            Timestamp.validate("Mon, 31 Feb 2015")
+
+    def test_json_roundtrip_parsed(self):
+        for value in self.parsed:
+            self.assertEqual(value, Timestamp.from_json(value.to_json()))
+
     def test_json_roundtrip_rfc2822timestamp(self):
         now = RFC2822Timestamp.now()
         self.assertIsInstance(now, RFC2822Timestamp)
@@ -487,7 +732,6 @@ class TestTimestamp(unittest.TestCase):
         self.assertEqual(now, data)
 
     def test_validate_datetime_object(self):
-        from datetime import datetime
         data = datetime.utcnow()
         now = Timestamp.validate(data)
         self.assertIsInstance(now, Timestamp)
@@ -495,7 +739,6 @@ class TestTimestamp(unittest.TestCase):
         self.assertEqual(now, dnow)
 
     def test_validate_delorean_object(self):
-        from delorean import Delorean
         data = Delorean()
         now = Timestamp.validate(data)
         self.assertIsInstance(now, Timestamp)
@@ -543,9 +786,118 @@ class TestSchemed(unittest.TestCase):
 
         origin_2d = Point(x=0.0, y=0.0)
         self.assertFalse(hasattr(origin_2d, "z"))
+        self.assertFalse(origin_2d.has_field("z"))
 
         origin_3d = Point(x=0.0, y=0.0, z=0.0)
         self.assertTrue(hasattr(origin_3d, "z"))
+        self.assertTrue(origin_3d.has_field("z"))
+
+    def test_optional_default_instance_fields(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float, "z": Optional(float, 0.0) }
+
+        origin = Point(x=0.0, y=0.0)
+        self.assertEqual(0.0, origin.z)
+        self.assertListEqual(["x", "y", "z"], list(origin.keys()))
+
+    def test_schema_fast_validate(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float }
+        self.assertEqual({ "x": 1.0, "y": 2.0 },
+                Point.__fast_validate__({ "x": 1.0, "y": 2.0 }))
+        with self.assertRaises(SchemaError):
+            Point.__fast_validate__({ "x": 1.0, "y": 2 })
+
+    def test_schema_fast_validate_shared(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float }
+        class Vector(Schemed):
+            __schema__ = { "x": float, "y": float }
+        self.assertIs(Point.__fast_validate__, Vector.__fast_validate__)
+
+    def test_memoize(self):
+        calls = []
+        def check(value):
+            calls.append(value)
+            return value
+        class Point(Schemed):
+            __schema__ = { "x": And(float, check), "y": float }
+            __memoize__ = 2
+        p1 = Point(x=1.0, y=2.0)
+        p2 = Point(y=2.0, x=1.0)
+        self.assertEqual([1.0], calls)
+        self.assertEqual(1.0, p2.x)
+        # Instances do not share their data.
+        p1.y = 3.0
+        self.assertEqual(2.0, p2.y)
+        self.assertEqual(2.0, Point(x=1.0, y=2.0).y)
+        # Values of different types are not mixed up.
+        with self.assertRaises(SchemaError):
+            Point(x=1, y=2.0)
+        # Oldest entries get evicted.
+        Point(x=3.0, y=0.0)
+        Point(x=4.0, y=0.0)
+        Point(x=1.0, y=2.0)
+        self.assertEqual([1.0, 3.0, 4.0, 1.0], calls)
+
+    def test_memoize_float_values(self):
+        calls = []
+        def check(value):
+            calls.append(value)
+            return True
+        class Point(Schemed):
+            __schema__ = { "x": And(float, check) }
+            __memoize__ = 16
+        self.assertEqual("0.0", repr(Point(x=0.0).x))
+        self.assertEqual("-0.0", repr(Point(x=-0.0).x))
+        self.assertEqual('{"x": -0.0}', Point(x=-0.0).to_json())
+        self.assertEqual(2, len(calls))
+        # NaN values are not equal to themselves, but still get cached.
+        Point(x=float("nan"))
+        Point(x=float("nan"))
+        self.assertEqual(3, len(calls))
+
+    def test_memoize_uuid_fields(self):
+        calls = []
+        def check(value):
+            calls.append(value)
+            return value
+        class Entry(Schemed):
+            __schema__ = { "id": UUID, "name": And(str, check) }
+            __memoize__ = 8
+        data = { "id": "5c2ddc84-bf99-47d2-a0da-3882b9d788ed", "name": "a" }
+        e1 = Entry(**data)
+        e2 = Entry(**data)
+        self.assertEqual(["a"], calls)
+        self.assertIsInstance(e2.id, UUID)
+        self.assertEqual(e1.id, e2.id)
+
+    def test_memoize_mutable_results(self):
+        class Entry(Schemed):
+            __schema__ = { "tags": Use(list) }
+            __memoize__ = 8
+        e1 = Entry(tags=("a",))
+        e2 = Entry(tags=("a",))
+        e1.tags.append("b")
+        self.assertListEqual(["a"], e2.tags)
+
+    def test_field_names_do_not_shadow_methods(self):
+        class Entry(Schemed):
+            __schema__ = { "keys": [str], "name": str }
+        value = Entry(keys=["a", "b"], name="entry")
+        self.assertEqual("entry", value.name)
+        self.assertListEqual(["keys", "name"], list(sorted(value.keys())))
+        self.assertListEqual(["a", "b"], value.jsonable["keys"])
+
+    def test_schema_compiled_validators_shared(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float, "z": Optional(float) }
+        class Vector(Schemed):
+            __schema__ = Schema({ "x": float, "y": float, "z": Optional(float) })
+        self.assertIsNot(Point.__schema__, Vector.__schema__)
+        self.assertIs(Point.__schema__._validate, Vector.__schema__._validate)
+        self.assertDictEqual(Point.__field_validators__,
+                Vector.__field_validators__)
 
     def test_validate_non_dict(self):
         class Point(Schemed):
@@ -553,6 +905,49 @@ class TestSchemed(unittest.TestCase):
         with self.assertRaises(ValueError):
             value = Point.validate("foobar")
 
+    def test_validate_dict_subclass(self):
+        class Point(Schemed):
+            __schema__ = { "x": int, "y": Optional(int) }
+        value = Point.validate(Counter(x=1))
+        self.assertIs(dict, type(value._data))
+        self.assertFalse(hasattr(value, "y"))
+        value = Point.validate(OrderedDict(x=1, y=2))
+        self.assertIs(dict, type(value.jsonable))
+
+    def test_validate_custom_init(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float }
+            def __init__(self, x, y):
+                super(Point, self).__init__(x=x * 2, y=y * 2)
+        value = Point.validate({ "x": 1.0, "y": 2.0 })
+        self.assertEqual(2.0, value.x)
+        self.assertEqual(4.0, value.y)
+
+    def test_validate_shared_schema(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float }
+        class NamedPoint(Point):
+            pass
+        value = NamedPoint.validate(Point(x=1.1, y=2.2))
+        self.assertIsInstance(value, NamedPoint)
+        self.assertEqual(1.1, value.x)
+        self.assertEqual(2.2, value.y)
+
+    def test_validate_shared_schema_custom_init(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float }
+        class MovedPoint(Point):
+            def __init__(self, x, y):
+                super(MovedPoint, self).__init__(x=x + 100.0, y=y)
+        value = MovedPoint.validate(Point(x=1.0, y=2.0))
+        self.assertIsInstance(value, MovedPoint)
+        self.assertEqual(101.0, value.x)
+        self.assertEqual(2.0, value.y)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(WithContinent(continent=Continent.ASIA),
+                "__dict__"))
+
     def test_set_non_schema_key(self):
         class Point(Schemed):
             __schema__ = { "x": float, "y": float }
@@ -578,6 +973,14 @@ class TestSchemed(unittest.TestCase):
         self.assertEqual(1.1, value.x)
         self.assertEqual(2.2, value.y)
 
+    def test_set_unknown_field(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float }
+        value = Point(x=1.1, y=2.2)
+        with self.assertRaises(SchemaError):
+            value.z = 3.3
+        self.assertListEqual(["x", "y"], list(sorted(value.keys())))
+
     def test_set_optional_field(self):
         class Point(Schemed):
             __schema__ = { "x": float, "y": float, "z": Optional(float) }
@@ -619,6 +1022,31 @@ class TestSchemed(unittest.TestCase):
         self.assertEqual(7.7, value.y)
         self.assertEqual(9.9, value.z)
 
+    def test_set_field_keeps_schema_order(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": Optional(float), "z": float }
+        value = Point(x=1.1, z=3.3)
+        data = value.jsonable
+        value.y = 2.2
+        self.assertListEqual(["x", "y", "z"], list(value.keys()))
+        self.assertListEqual(["x", "z"], list(data.keys()))
+        value.update(y=4.4)
+        self.assertListEqual(["x", "y", "z"], list(value.keys()))
+        self.assertEqual(value.to_json(), value.to_json(indent=None))
+
+    def test_update_override(self):
+        class Point(Schemed):
+            __schema__ = { "x": float, "y": float }
+            def update(self, *arg, **kw):
+                kw = dict(*arg, **kw)
+                return super(Point, self).update(dict((k, float(v))
+                    for k, v in kw.items()))
+        value = Point(x=1, y=2)
+        self.assertEqual(1.0, value.x)
+        self.assertEqual(2.0, value.y)
+        value.x = 3
+        self.assertEqual(3.0, value.x)
+
     def test_update_invalid_value(self):
         class Point(Schemed):
             __schema__ = { "x": float, "y": float }
@@ -627,6 +1055,14 @@ class TestSchemed(unittest.TestCase):
             origin.update(x="invalid type")
         self.assertEqual(0.0, origin.x)
         self.assertEqual(0.0, origin.y)
+        with self.assertRaises(SchemaError):
+            origin.update(x=1.0, y="invalid type")
+        self.assertEqual(0.0, origin.x)
+        self.assertEqual(0.0, origin.y)
+        with self.assertRaises(SchemaError):
+            origin.update(x=1.0, z=1.0)
+        self.assertEqual(0.0, origin.x)
+        self.assertFalse(origin.has_field("z"))
 
     def test_instantiate_wrong_value_type(self):
         class Point(Schemed):
@@ -691,6 +1127,59 @@ class TestToJSON(unittest.TestCase):
         nv = NestedValue(value=ListValue(value=[1, 2, 3]))
         self.assertEqual('{"value": {"value": [1, 2, 3]}}', nv.to_json())
 
+    def test_same_as_encoder(self):
+        class Value(Schemed):
+            __schema__ = { "s": str, "i": int, "f": float, "n": NestedValue,
+                    "c": Continent, "o": Optional(float), "a": object }
+        class Text(str):
+            pass
+        values = (
+            Value(s="h\u00e9llo\n\"", i=True, f=float("nan"),
+                n={"value": {"value": [1]}}, c="ASIA", a=None),
+            Value(s=Text("text"), i=2 ** 70, f=-0.0, o=float("inf"),
+                n={"value": {"value": []}},
+                c=Continent.EUROPE, a={"k": [1.5]}),
+        )
+        for value in values:
+            self.assertEqual(json.dumps(value, cls=GnarlJSONEncoder),
+                    value.to_json())
+
+    def test_optional_jsonable_defaults(self):
+        class Holder(Schemed):
+            __schema__ = { "name": str,
+                    "child": Optional(ListValue, default=None) }
+        class DictHolder(Schemed):
+            __schema__ = { "name": str,
+                    "child": Optional(ListValue, default={ "value": [] }) }
+        self.assertEqual('{"name": "a", "child": null}',
+                Holder(name="a").to_json())
+        self.assertEqual('{"name": "a", "child": {"value": []}}',
+                DictHolder(name="a").to_json())
+
+    def test_defaults_same_as_encoder(self):
+        class Value(Schemed):
+            __schema__ = { "a": Optional(int, default=0), "b": int }
+        value = Value(b=1)
+        self.assertListEqual(["a", "b"], list(value.keys()))
+        self.assertEqual('{"a": 0, "b": 1}', value.to_json())
+        self.assertEqual(value.to_json(), value.to_json(indent=None))
+        with self.assertRaises(SchemaError):
+            Value(b=1, c=2)
+
+    def test_jsonable_override(self):
+        class Point(Schemed):
+            __schema__ = { "x": int, "y": int }
+            @property
+            def jsonable(self):
+                return [self.x, self.y]
+        self.assertEqual("[1, 2]", Point(x=1, y=2).to_json())
+
+    def test_not_serializable(self):
+        class AnyValue(Schemed):
+            __schema__ = { "value": object }
+        with self.assertRaises(TypeError):
+            AnyValue(value=object()).to_json()
+
 
 class TestFromJSON(unittest.TestCase):
     def test_empty_list(self):
@@ -714,6 +1203,22 @@ class TestFromJSON(unittest.TestCase):
         self.assertIsInstance(nv.value, ListValue)
         self.assertListEqual([4, 5, 6], nv.value.value)
 
+    def test_whitespace(self):
+        lv = ListValue.from_json(' {"value": [1, 2]}\n')
+        self.assertListEqual([1, 2], lv.value)
+
+    def test_bytes(self):
+        lv = ListValue.from_json(b'{"value": [1, 2]}')
+        self.assertListEqual([1, 2], lv.value)
+
+    def test_json_loads(self):
+        for data in ('{}', '[]', '""', '0', 'null', 'NaN', ' {} ', '{"a": 1}',
+                '[1, {"b": [2.5, true]}]', '"\\u00e9"'):
+            self.assertEqual(repr(json.loads(data)), repr(_json_loads(data)))
+        for data in ('', ' ', '{', '{}x', '{} []', '[1,]', 'nul'):
+            with self.assertRaises(ValueError):
+                _json_loads(data)
+
 
 class TestToHiPack(unittest.TestCase):
     def test_empty_list(self):
@@ -761,11 +1266,18 @@ class TestFromHiPack(unittest.TestCase):
         self.assertEqual([4, 5, 6], nv.value.value)
 
 
+# Parsed doctests, reused if load_tests() gets called again. The cases are
+# kept instead of the suite, which gets emptied as its tests are run.
+_doc_tests = None
+
 def load_tests(loader, tests, ignore):
-    tests.addTests(doctest.DocFileSuite(
-        "README.rst",
-        "doc/quickstart.rst",
-        optionflags=doctest.REPORT_NDIFF))
+    global _doc_tests
+    if _doc_tests is None:
+        _doc_tests = tuple(doctest.DocFileSuite(
+            "README.rst",
+            "doc/quickstart.rst",
+            optionflags=doctest.REPORT_NDIFF))
+    tests.addTests(_doc_tests)
     return tests
 
 if __name__ == "__main__":